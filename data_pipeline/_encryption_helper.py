@@ -20,7 +20,10 @@ import os
 from collections import namedtuple
 
 import simplejson
-from Crypto.Cipher import AES
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.ciphers import algorithms
+from cryptography.hazmat.primitives.ciphers import Cipher
+from cryptography.hazmat.primitives.ciphers import modes
 
 from data_pipeline.config import get_config
 from data_pipeline.helpers.decorators import memoized
@@ -29,6 +32,10 @@ from data_pipeline.initialization_vector import get_initialization_vector
 from data_pipeline.schematizer_clientlib.schematizer import get_schematizer
 
 
+# AES block size in bytes; `algorithms.AES.block_size` is expressed in bits.
+_AES_BLOCK_SIZE = algorithms.AES.block_size // 8
+
+
 _AVSCInfo = namedtuple('_AVSCInfo', (
     'id',
     'avsc_file_path',
@@ -165,15 +172,21 @@ class EncryptionHelper(object):
             "Encryption algorithm {} is not supported.".format(algorithm)
         )
 
+    def _create_cipher(self):
+        """AES-CBC cipher going through OpenSSL's EVP interface, which uses
+        AES-NI when the CPU supports it.
+        """
+        return Cipher(
+            algorithms.AES(self.key),
+            modes.CBC(self.encryption_meta.payload),
+            backend=default_backend()
+        )
+
     def encrypt_payload(self, payload):
         """Encrypt payload with key on machine, using AES."""
-        encrypter = AES.new(
-            self.key,
-            AES.MODE_CBC,
-            self.encryption_meta.payload
-        )
+        encryptor = self._create_cipher().encryptor()
         payload = self._pad_payload(payload)
-        return encrypter.encrypt(payload)
+        return encryptor.update(payload) + encryptor.finalize()
 
     def _pad_payload(self, payload):
         """payloads must have length equal to a multiple of 16 in order to
@@ -182,16 +195,12 @@ class EncryptionHelper(object):
         to the end of payload before encrypting it, and the _unpad method
         removes those bytes.
         """
-        length = 16 - (len(payload) % 16)
+        length = _AES_BLOCK_SIZE - (len(payload) % _AES_BLOCK_SIZE)
         return payload + chr(length) * length
 
     def decrypt_payload(self, payload):
-        decrypter = AES.new(
-            self.key,
-            AES.MODE_CBC,
-            self.encryption_meta.payload
-        )
-        data = decrypter.decrypt(payload)
+        decryptor = self._create_cipher().decryptor()
+        data = decryptor.update(payload) + decryptor.finalize()
         return self._unpad(data)
 
     def _unpad(self, payload):
@@ -201,4 +210,4 @@ class EncryptionHelper(object):
 @memoized
 def fetch_encyption_key(file_name):
     with open(file_name, 'r') as f:
-        return f.read(AES.block_size)
+        return f.read(_AES_BLOCK_SIZE)
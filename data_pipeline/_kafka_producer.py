@@ -35,32 +35,53 @@ from data_pipeline._retry_util import retry_on_condition
 from data_pipeline._retry_util import RetryPolicy
 from data_pipeline.config import get_config
 from data_pipeline.envelope import Envelope
+from data_pipeline.helpers.decorators import memoized
 
 
 _EnvelopeAndMessage = namedtuple("_EnvelopeAndMessage", ["envelope", "message"])
 logger = get_config().logger
 
 
+class PublishedMessageCountMismatchError(Exception):
+    """Raised when the number of messages published to a topic doesn't match
+    the number of messages buffered for it.
+    """
+
+
 # prepare needs to be in the module top level so it can be serialized for
 # multiprocessing
 def _prepare(envelope_and_message):
+    return _pack_message(
+        envelope_and_message.envelope,
+        envelope_and_message.message
+    )
+
+
+def _pack_message(envelope, message):
     try:
-        kwargs = {}
-        if envelope_and_message.message.keys:
-            kwargs['key'] = envelope_and_message.message.encoded_keys
-        return create_message(
-            envelope_and_message.envelope.pack(envelope_and_message.message),
-            **kwargs
-        )
+        key = message.encoded_keys if message.keys else None
+        return create_message(envelope.pack(message), key=key)
     except:
         logger.exception('Prepare failed')
         raise
 
 
+@memoized
+def _get_envelope():
+    """Envelopes only cache their schema and avro writer/reader, so a single
+    instance is shared by all the producers in the process.
+    """
+    return Envelope()
+
+
 class KafkaProducer(object):
     """The KafkaProducer deals with buffering messages that need to be published
     into Kafka, preparing them for publication, and ultimately publishing them.
 
+    The flush limits are read from the config once, when the producer is
+    created.  Config changes made afterwards only take effect once
+    :meth:`reload_config` is called.
+
     Args:
         producer_position_callback (function): The producer position callback
             is called when the KafkaProducer is instantiated, and every time
@@ -71,13 +92,14 @@ class KafkaProducer(object):
     """
     @cached_property
     def envelope(self):
-        return Envelope()
+        return _get_envelope()
 
     def __init__(self, producer_position_callback, dry_run=False):
         self.producer_position_callback = producer_position_callback
         self.dry_run = dry_run
         self.kafka_client = KafkaClient(get_config().cluster_config.broker_list)
         self.position_data_tracker = PositionDataTracker()
+        self.reload_config()
         self._reset_message_buffer()
         self.skip_messages_with_pii = get_config().skip_messages_with_pii
         self._publish_retry_policy = RetryPolicy(
@@ -86,6 +108,16 @@ class KafkaProducer(object):
         )
         self._automatic_flush_enabled = True
 
+    def reload_config(self):
+        """Re-reads the flush limits from the config.  The limits are checked
+        on every publish, so they're cached when the producer is created rather
+        than looked up each time.
+        """
+        config = get_config()
+        self._flush_time_limit = config.kafka_producer_flush_time_limit_seconds
+        self._flush_buffer_size = config.kafka_producer_buffer_size
+        self._flush_buffer_size_bytes = config.kafka_producer_buffer_size_bytes
+
     @contextmanager
     def disable_automatic_flushing(self):
         """Prevents the producer from flushing automatically (e.g. for timeouts
@@ -124,6 +156,10 @@ class KafkaProducer(object):
         self._flush_if_necessary()
 
     def flush_buffered_messages(self):
+        if self.message_buffer_size == 0:
+            # Nothing to publish or report, so just restart the flush timer.
+            self.start_time = time.time()
+            return
         produce_method = (self._publish_produce_requests_dry_run
                           if self.dry_run else self._publish_produce_requests)
         produce_method(self._generate_produce_requests())
@@ -141,9 +177,13 @@ class KafkaProducer(object):
 
         Each time the requests that are successfully published in the previous
         round will be removed from the requests and won't be published again.
+
+        Args:
+            requests (list of kafka.common.ProduceRequest): requests to publish.
+                The list is handed to the retry handler as is, and is iterated
+                once for every retry round, so it must not be a generator.
         """
-        unpublished_requests = list(requests)
-        retry_handler = RetryHandler(self.kafka_client, unpublished_requests)
+        retry_handler = RetryHandler(self.kafka_client, requests)
 
         def has_requests_to_be_sent():
             return bool(retry_handler.requests_to_be_sent)
@@ -201,7 +241,20 @@ class KafkaProducer(object):
     def _record_success_requests(self, success_topic_stats_map):
         for topic_partition, stats in success_topic_stats_map.iteritems():
             topic = topic_partition.topic_name
-            assert stats.message_count == len(self.message_buffer[topic])
+            # `message_buffer` is a defaultdict, so indexing it here would
+            # silently add an empty buffer for a topic that isn't buffered.
+            buffered_message_count = len(self.message_buffer.get(topic, ()))
+            # This is checked explicitly rather than asserted so that it still
+            # holds when running with assertions disabled.
+            if stats.message_count != buffered_message_count:
+                raise PublishedMessageCountMismatchError(
+                    "{0} messages were published to topic {1}, but {2} "
+                    "messages were buffered.".format(
+                        stats.message_count,
+                        topic,
+                        buffered_message_count
+                    )
+                )
             self.position_data_tracker.record_messages_published(
                 topic=topic,
                 offset=stats.original_offset,
@@ -223,10 +276,14 @@ class KafkaProducer(object):
         )
 
     def _is_ready_to_flush(self):
-        time_limit = get_config().kafka_producer_flush_time_limit_seconds
+        """The buffer is flushed once the linger time limit has elapsed, or
+        once either the buffered message count or the buffered bytes reach
+        their limits, whichever comes first.
+        """
         return (self._automatic_flush_enabled and (
-            (time.time() - self.start_time) >= time_limit or
-            self.message_buffer_size >= get_config().kafka_producer_buffer_size
+            (time.time() - self.start_time) >= self._flush_time_limit or
+            self.message_buffer_size >= self._flush_buffer_size or
+            self.message_buffer_bytes >= self._flush_buffer_size_bytes
         ))
 
     def _flush_if_necessary(self):
@@ -239,6 +296,10 @@ class KafkaProducer(object):
 
         self.message_buffer[topic].append(message)
         self.message_buffer_size += 1
+        self.message_buffer_bytes += self._get_message_size(message)
+
+    def _get_message_size(self, prepared_message):
+        return len(prepared_message.value) + len(prepared_message.key or b'')
 
     def _generate_produce_requests(self):
         return [
@@ -250,7 +311,10 @@ class KafkaProducer(object):
         return self.message_buffer.iteritems()
 
     def _prepare_message(self, message):
-        return _prepare(_EnvelopeAndMessage(envelope=self.envelope, message=message))
+        # Messages are packed synchronously here, so there's no need to
+        # allocate an _EnvelopeAndMessage for each of them; that wrapper only
+        # exists to ship work to the PooledKafkaProducer's pool.
+        return _pack_message(self.envelope, message)
 
     def _reset_message_buffer(self):
         if not hasattr(self, 'message_buffer_size') or self.message_buffer_size > 0:
@@ -258,6 +322,7 @@ class KafkaProducer(object):
         self.start_time = time.time()
         self.message_buffer = defaultdict(list)
         self.message_buffer_size = 0
+        self.message_buffer_bytes = 0
 
 
 class LoggingKafkaProducer(KafkaProducer):
@@ -18,10 +18,13 @@ from __future__ import unicode_literals
 
 from multiprocessing import Pool
 
+from cached_property import cached_property
+
 from data_pipeline._kafka_producer import _EnvelopeAndMessage
 from data_pipeline._kafka_producer import _prepare
 from data_pipeline._kafka_producer import LoggingKafkaProducer
 from data_pipeline.config import get_config
+from data_pipeline.envelope import Envelope
 
 
 logger = get_config().logger
@@ -39,6 +42,13 @@ class PooledKafkaProducer(LoggingKafkaProducer):
     TODO(DATAPIPE-171|justinc): Actually write a Quick Start
     """
 
+    @cached_property
+    def envelope(self):
+        # The envelope is pickled into every job sent to the pool, so this
+        # producer keeps its own instead of sharing one that may have cached
+        # schema state from packing messages in this process.
+        return Envelope()
+
     def __init__(self, *args, **kwargs):
         self.pool = Pool()
         super(PooledKafkaProducer, self).__init__(*args, **kwargs)
@@ -68,11 +78,22 @@ class PooledKafkaProducer(LoggingKafkaProducer):
         """This happens in the pool, so this is a noop"""
         return message
 
+    def _get_message_size(self, message):
+        """Messages aren't packed until they're flushed, so their packed size
+        isn't known here.  Reading the payload would encode it in this process,
+        so the byte limit isn't applied to the pooled producer.
+        """
+        return 0
+
     def _generate_prepared_topic_and_messages(self):
-        # The setup here isn't great, it's probably worth switching this to
-        # keep the buffer in an array, then map it here.  It'd also be worth
-        # looking at pipelining this, so there would be a regular buffer, and a
-        # buffer that was being prepared.
+        # All the buffered messages are flattened and prepared with a single
+        # map call, so the pool splits the whole batch into evenly sized
+        # chunks instead of working through one small job per topic.  The
+        # results are in the same order as the input, so they're regrouped
+        # by topic using the number of messages buffered for each topic.
+        #
+        # It'd also be worth looking at pipelining this, so there would be a
+        # regular buffer, and a buffer that was being prepared.
         #
         # That would look like:
         #
@@ -95,14 +116,23 @@ class PooledKafkaProducer(LoggingKafkaProducer):
         # free workers). The send-requests workers can then send the messages
         # in bulk or every certain amount of time. The down side is this is a
         # more complicated approach.
-        topics_and_messages_result = [
-            (topic, self.pool.map_async(
-                _prepare,
-                [
-                    _EnvelopeAndMessage(envelope=self.envelope, message=message)
-                    for message in messages
-                ]
-            )) for topic, messages in self.message_buffer.iteritems()
-        ]
-
-        return [(topic, messages_result.get()) for topic, messages_result in topics_and_messages_result]
+        topics_and_message_counts = []
+        envelope_and_messages = []
+        for topic, messages in self.message_buffer.iteritems():
+            topics_and_message_counts.append((topic, len(messages)))
+            envelope_and_messages.extend(
+                _EnvelopeAndMessage(envelope=self.envelope, message=message)
+                for message in messages
+            )
+
+        prepared_messages = self.pool.map(_prepare, envelope_and_messages)
+
+        topics_and_prepared_messages = []
+        start = 0
+        for topic, message_count in topics_and_message_counts:
+            end = start + message_count
+            topics_and_prepared_messages.append(
+                (topic, prepared_messages[start:end])
+            )
+            start = end
+        return topics_and_prepared_messages
@@ -356,6 +356,18 @@ class Config(object):
             default=5000
         )
 
+    @property
+    def kafka_producer_buffer_size_bytes(self):
+        """The maximum number of bytes of packed messages that the clientlib
+        will buffer before sending them out to kafka.  This limit isn't applied
+        when the producer uses a work pool, since messages aren't packed until
+        they're flushed.
+        """
+        return data_pipeline_conf.read_int(
+            'kafka_producer_buffer_size_bytes',
+            default=10 * 1024 * 1024
+        )
+
     @property
     def kafka_producer_flush_time_limit_seconds(self):
         """The maximum amount of time in seconds that the clientlib will wait
@@ -48,6 +48,9 @@ class Envelope(object):
         'FAKE MESSAGE'
     """
 
+    # Magic byte value of packed message specifying the envelope schema version.
+    MAGIC_BYTE = bytes(0)
+
     # Magic byte value of packed message specifying that it is base64 encoded.
     # This value was chosen because it is valid ASCII
     ASCII_MAGIC_BYTE = bytes('a')
@@ -93,7 +96,7 @@ class Envelope(object):
         Producer/Consumer registration will make use of this to instead send base64
         encoded strings.
         """
-        msg = bytes(0) + self._avro_string_writer.encode(message.avro_repr)
+        msg = self.MAGIC_BYTE + self._avro_string_writer.encode(message.avro_repr)
 
         if ascii_encoded:
             return self.ASCII_MAGIC_BYTE + base64.urlsafe_b64encode(msg)
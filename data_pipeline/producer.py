@@ -45,7 +45,7 @@ class Producer(Client):
 
     When messages are handed to a producer via the :meth:`publish` method, they
     aren't immediately published into Kafka.  Instead, they're buffered until
-    a number of messages are accumulated, or too much time has passed,
+    a number of messages or bytes are accumulated, or too much time has passed,
     then published all at once.  This process is designed to be largely
     transparent to the user.
 
@@ -273,19 +273,20 @@ class Producer(Client):
             timestamp (timezone aware timestamp): utc datetime of event
         """
         self._kafka_producer.publish(message)
+        now = time.time()
 
         if self.enable_meteorite:
             self.monitors['meteorite'].process(message.topic)
 
-        if self.enable_sensu and time.time() > self._next_sensu_update:
-            self._next_sensu_update = time.time() + self._sensu_window
+        if self.enable_sensu and now > self._next_sensu_update:
+            self._next_sensu_update = now + self._sensu_window
             self.monitors['sensu_ttl'].process()
             self.monitors['sensu_delay'].process(timestamp)
 
         self.monitor.record_message(message)
         self.registrar.update_schema_last_used_timestamp(
             message.schema_id,
-            timestamp_in_milliseconds=long(1000 * time.time())
+            timestamp_in_milliseconds=long(1000 * now)
         )
 
     def ensure_messages_published(self, messages, topic_offsets):
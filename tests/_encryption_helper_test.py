@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import binascii
+
+import mock
+import pytest
+from Crypto.Cipher import AES
+
+from data_pipeline._encryption_helper import EncryptionHelper
+
+
+class TestEncryptionHelper(object):
+
+    @property
+    def initialization_vector(self):
+        return b'0123456789abcdef'
+
+    @property
+    def payload(self):
+        return b'FAKE PAYLOAD'
+
+    @property
+    def encrypted_payload(self):
+        # AES-128-CBC ciphertext of `payload` padded to 16 bytes, using the
+        # first 16 bytes of key-1.key and `initialization_vector`.
+        return binascii.unhexlify(b'fa4c3f990c389ec69a06fce4e919de4e')
+
+    @pytest.fixture
+    def encryption_helper(self):
+        return EncryptionHelper(
+            'AES_MODE_CBC-1',
+            encryption_meta=mock.Mock(payload=self.initialization_vector)
+        )
+
+    def test_encrypt_payload(self, encryption_helper):
+        actual = encryption_helper.encrypt_payload(self.payload)
+        assert actual == self.encrypted_payload
+
+    def test_encrypt_payload_matches_pycrypto(self, encryption_helper):
+        pycrypto_encrypter = AES.new(
+            encryption_helper.key,
+            AES.MODE_CBC,
+            self.initialization_vector
+        )
+        expected = pycrypto_encrypter.encrypt(
+            encryption_helper._pad_payload(self.payload)
+        )
+        assert expected == self.encrypted_payload
+        assert encryption_helper.encrypt_payload(self.payload) == expected
+
+    def test_decrypt_payload(self, encryption_helper):
+        actual = encryption_helper.decrypt_payload(self.encrypted_payload)
+        assert actual == self.payload
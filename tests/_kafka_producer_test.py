@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import mock
+import pytest
+from kafka import create_message
+
+from data_pipeline._kafka_producer import KafkaProducer
+from data_pipeline._kafka_producer import PublishedMessageCountMismatchError
+from data_pipeline._producer_retry import _Stats
+from data_pipeline._producer_retry import _TopicPartition
+from tests.helpers.config import reconfigure
+
+
+class TestKafkaProducer(object):
+
+    @property
+    def topic(self):
+        return str('my-topic')
+
+    @property
+    def prepared_message_size(self):
+        return 100
+
+    @pytest.yield_fixture
+    def mock_kafka_client(self):
+        with mock.patch(
+            'data_pipeline._kafka_producer.KafkaClient'
+        ) as mock_kafka_client_class:
+            yield mock_kafka_client_class.return_value
+
+    @pytest.yield_fixture(autouse=True)
+    def patch_pack_message(self):
+        with mock.patch(
+            'data_pipeline._kafka_producer._pack_message',
+            return_value=create_message(b'x' * self.prepared_message_size)
+        ):
+            yield
+
+    @pytest.fixture
+    def position_callback(self):
+        return mock.Mock()
+
+    @pytest.fixture
+    def producer(self, mock_kafka_client, position_callback):
+        return KafkaProducer(position_callback)
+
+    def create_message(self):
+        return mock.Mock(
+            topic=self.topic,
+            contains_pii=False,
+            upstream_position_info=None
+        )
+
+    def test_flush_when_buffer_size_bytes_reached(
+        self,
+        mock_kafka_client,
+        position_callback
+    ):
+        with reconfigure(
+            kafka_producer_buffer_size_bytes=3 * self.prepared_message_size,
+            kafka_producer_buffer_size=100,
+            kafka_producer_flush_time_limit_seconds=100
+        ):
+            producer = KafkaProducer(position_callback)
+        with mock.patch.object(
+            producer,
+            'flush_buffered_messages'
+        ) as mock_flush:
+            producer.publish(self.create_message())
+            producer.publish(self.create_message())
+            assert not mock_flush.called
+
+            producer.publish(self.create_message())
+            assert mock_flush.call_count == 1
+        assert producer.message_buffer_bytes == 3 * self.prepared_message_size
+
+    def test_flush_limits_read_at_creation(self, producer):
+        with reconfigure(kafka_producer_buffer_size=2):
+            assert producer._flush_buffer_size != 2
+            producer.reload_config()
+            assert producer._flush_buffer_size == 2
+
+    def test_flush_empty_buffer(
+        self,
+        producer,
+        mock_kafka_client,
+        position_callback
+    ):
+        position_callback.reset_mock()
+        producer.start_time = 0
+
+        producer.flush_buffered_messages()
+
+        assert not mock_kafka_client.send_produce_request.called
+        assert not position_callback.called
+        assert producer.start_time > 0
+
+    def test_envelope_shared_across_producers(
+        self,
+        producer,
+        mock_kafka_client,
+        position_callback
+    ):
+        assert producer.envelope is KafkaProducer(position_callback).envelope
+
+    def test_record_success_requests_with_mismatched_count(self, producer):
+        buffered_messages = [
+            create_message(b'x' * self.prepared_message_size)
+            for _ in range(2)
+        ]
+        producer.message_buffer[self.topic] = buffered_messages
+        success_topic_stats_map = {
+            _TopicPartition(self.topic, 0): _Stats(
+                original_offset=0,
+                message_count=1
+            )
+        }
+        with mock.patch.object(
+            producer.position_data_tracker,
+            'record_messages_published'
+        ) as mock_record_published, pytest.raises(
+            PublishedMessageCountMismatchError
+        ):
+            producer._record_success_requests(success_topic_stats_map)
+
+        assert not mock_record_published.called
+        assert producer.message_buffer[self.topic] == buffered_messages
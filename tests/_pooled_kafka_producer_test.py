@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# Copyright 2016 Yelp Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+from __future__ import absolute_import
+from __future__ import unicode_literals
+
+import pickle
+
+import mock
+import pytest
+
+from data_pipeline._kafka_producer import _get_envelope
+from data_pipeline._kafka_producer import KafkaProducer
+from data_pipeline._pooled_kafka_producer import PooledKafkaProducer
+
+
+class TestPooledKafkaProducer(object):
+
+    @pytest.yield_fixture
+    def producer(self):
+        with mock.patch(
+            'data_pipeline._kafka_producer.KafkaClient'
+        ), mock.patch(
+            'data_pipeline._pooled_kafka_producer.Pool'
+        ):
+            yield PooledKafkaProducer(mock.Mock())
+
+    def create_message(self):
+        return mock.Mock(
+            topic=str('my-topic'),
+            keys=None,
+            contains_pii=False,
+            upstream_position_info=None,
+            avro_repr={
+                'uuid': b'0' * 16,
+                'message_type': 'create',
+                'schema_id': 1,
+                'payload': b'FAKE PAYLOAD',
+                'timestamp': 0,
+                'meta': None,
+                'encryption_type': None
+            }
+        )
+
+    def test_envelope_not_shared(self, producer):
+        assert producer.envelope is not _get_envelope()
+
+    def test_pool_jobs_envelope_without_cached_state(self, producer):
+        # Packing a message with a synchronous producer populates the cached
+        # schema and writer of the shared envelope, which must not end up in
+        # the jobs sent to the pool.
+        with mock.patch('data_pipeline._kafka_producer.KafkaClient'):
+            KafkaProducer(mock.Mock())._prepare_message(self.create_message())
+        assert '_avro_string_writer' in _get_envelope().__dict__
+
+        producer.message_buffer[str('my-topic')].append(self.create_message())
+        producer.pool.map.return_value = [mock.Mock()]
+        producer._generate_prepared_topic_and_messages()
+
+        _, envelope_and_messages = producer.pool.map.call_args[0]
+        job_envelope = pickle.loads(
+            pickle.dumps(envelope_and_messages[0].envelope)
+        )
+        assert '_schema' not in job_envelope.__dict__
+        assert '_avro_string_writer' not in job_envelope.__dict__
+
+    def test_generate_prepared_topic_and_messages(self, producer):
+        producer.pool.map.side_effect = lambda func, envelope_and_messages: [
+            ('prepared', envelope_and_message.message)
+            for envelope_and_message in envelope_and_messages
+        ]
+        topic_to_messages = {
+            str('topic_a'): [mock.Mock() for _ in range(3)],
+            str('topic_b'): [mock.Mock()],
+            str('topic_c'): [mock.Mock() for _ in range(2)]
+        }
+        producer.message_buffer.update(topic_to_messages)
+
+        actual = producer._generate_prepared_topic_and_messages()
+
+        assert producer.pool.map.call_count == 1
+        assert dict(actual) == {
+            topic: [('prepared', message) for message in messages]
+            for topic, messages in topic_to_messages.iteritems()
+        }
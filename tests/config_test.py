@@ -102,6 +102,9 @@ class TestConfigDefaults(TestConfigBase):
     def test_kafka_producer_buffer_size(self, config):
         assert config.kafka_producer_buffer_size == 5000
 
+    def test_kafka_producer_buffer_size_bytes(self, config):
+        assert config.kafka_producer_buffer_size_bytes == 10 * 1024 * 1024
+
     def test_kafka_producer_flush_time_limit_seconds(self, config):
         assert config.kafka_producer_flush_time_limit_seconds == 0.1
 
@@ -235,6 +238,10 @@ class TestConfigurationOverrides(TestConfigBase):
         with reconfigure(kafka_producer_buffer_size=10):
             assert config.kafka_producer_buffer_size == 10
 
+    def test_kafka_producer_buffer_size_bytes(self, config):
+        with reconfigure(kafka_producer_buffer_size_bytes=1024):
+            assert config.kafka_producer_buffer_size_bytes == 1024
+
     def test_kafka_producer_flush_time_limit_seconds(self, config):
         with reconfigure(kafka_producer_flush_time_limit_seconds=3.2):
             assert config.kafka_producer_flush_time_limit_seconds == 3.2